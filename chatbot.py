@@ -1,3 +1,4 @@
+import re
 import streamlit as st
 import time
 from typing import Any
@@ -7,12 +8,18 @@ import modules.chatbot_model as model
 import modules.chatbot_view as view
 
 # Core Logic
-from modules.chatbot_model import initialize_chat_session
-from modules.auth_manager import check_quota_available, increment_usage
+from modules.auth_manager import check_quota_available, consume_quota, refund_quota
 
 ROLE_USER = "user"
 ROLE_ASSISTANT = "assistant"
 
+# Deteksi pertanyaan portofolio untuk SMART CONTEXT INJECTION.
+# Precompiled sekali di module scope; case-insensitive substring match.
+_PORTFOLIO_RE = re.compile(
+    r"portofolio|portfolio|holding|saham saya|investasi saya|cek aset",
+    re.IGNORECASE,
+)
+
 def show_chatbot() -> None:
     # 1. Auth Check
     current_user = st.session_state.get("username")
@@ -21,7 +28,8 @@ def show_chatbot() -> None:
         return
 
     # 2. UI Setup
-    view.render_sidebar_controls()
+    if view.render_sidebar_controls():
+        model.clear_history(current_user)
     view.render_header()
 
     # 3. Quota Check
@@ -33,18 +41,14 @@ def show_chatbot() -> None:
 
     # 4. History Management
     if st.session_state.get("_chat_loaded_user") != current_user:
-        st.session_state.messages = model.load_history(current_user)
+        st.session_state.messages = list(model.load_history_cached(current_user))
         st.session_state["_chat_loaded_user"] = current_user
-        # Reset session chat jika ganti user
-        if "chat_session" in st.session_state: 
-            del st.session_state.chat_session
 
     # 5. Gemini Init (USE AUTOMATIC FUNCTION CALLING DARI MODEL)
     try:
-        if "chat_session" not in st.session_state:
-            # initialize_chat_session sudah meng-inject tools dan set auto_function_calling=True
-            st.session_state.chat_session = initialize_chat_session()
-            
+        # get_chat_session di-cache per user (st.cache_resource), jadi
+        # tools hanya di-inject sekali dan sesi bertahan antar halaman.
+        st.session_state.chat_session = model.get_chat_session(current_user)
     except Exception as e:
         st.error(f"Service Unavailable: {e}")
         return
@@ -55,16 +59,15 @@ def show_chatbot() -> None:
     # 7. Main Interaction Loop
     if is_allowed:
         if prompt := view.get_user_input():
-            # Quota Double Check
-            ok, _ = check_quota_available(current_user)
+            # Consume quota atomically (check + increment in one operation)
+            ok, _ = consume_quota(current_user)
             if not ok: st.error("Quota Limit Reached."); st.stop()
 
             # SMART CONTEXT INJECTION
-            keywords = ["portofolio", "portfolio", "holding", "saham saya", "investasi saya", "cek aset"]
             final_prompt_to_ai = prompt
-            
+
             # Jika user tanya portfolio, inject datanya
-            if any(k in prompt.lower() for k in keywords):
+            if _PORTFOLIO_RE.search(prompt):
                 with st.spinner("🔄 Mengambil data portofolio real-time..."):
                     context_data = model.get_portfolio_context(current_user)
                     # bungkus prompt user dengan data portfolio
@@ -74,11 +77,12 @@ def show_chatbot() -> None:
                         f"Instruction: Jawab User Query berdasarkan Context Data di atas."
                     )
             
-            # Save User Message to UI & History
-            st.session_state.messages.append({"role": ROLE_USER, "content": prompt})
+            # Save User Message to UI & History (append-only delta)
+            user_msg = {"role": ROLE_USER, "content": prompt}
+            st.session_state.messages.append(user_msg)
             with st.chat_message(ROLE_USER):
                 st.markdown(prompt)
-            model.save_history(current_user, st.session_state.messages)
+            model.append_message(current_user, user_msg)
 
             # Process Response
             process_ai_response_auto(current_user, final_prompt_to_ai)
@@ -97,11 +101,13 @@ def process_ai_response_auto(user: str, prompt_text: str):
             if "last_chart" in st.session_state:
                 st.session_state["last_chart"] = None
 
-            # --- KIRIM KE GEMINI (AUTO EXECUTE)
+            # --- KIRIM KE GEMINI
+            # Blocking call: SDK menolak stream=True saat automatic
+            # function calling aktif (NotImplementedError), jadi sesi
+            # dari get_chat_session tidak bisa streaming sama sekali.
             response = st.session_state.chat_session.send_message(prompt_text)
-            
-            # Ambil Text Final
             final_text = response.text
+
             message_placeholder.markdown(final_text)
 
             # --- CEK SIDE EFFECT: CHART
@@ -113,17 +119,18 @@ def process_ai_response_auto(user: str, prompt_text: str):
                 # Reset
                 st.session_state["last_chart"] = None
 
-            # SIMPAN KE HISTORY
-            st.session_state.messages.append({
-                "role": ROLE_ASSISTANT, 
-                "content": final_text, 
+            # SIMPAN KE HISTORY (append-only delta)
+            assistant_msg = {
+                "role": ROLE_ASSISTANT,
+                "content": final_text,
                 "chart": chart_obj
-            })
-            model.save_history(user, st.session_state.messages)
-            
-            increment_usage(user)
+            }
+            st.session_state.messages.append(assistant_msg)
+            model.append_message(user, assistant_msg)
 
     except Exception as e:
+        # No answer delivered: give the pre-consumed quota unit back
+        refund_quota(user)
         error_msg = str(e)
         if "index" in error_msg or "finish_reason" in error_msg:
             st.error("Maaf, permintaan terlalu kompleks atau data saham tidak ditemukan. Coba kode saham yang valid.")
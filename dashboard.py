@@ -1,4 +1,6 @@
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+
 import modules.dashboard_model as model
 import modules.dashboard_view as view
 
@@ -12,14 +14,37 @@ Fetch Data (Model) -> Render UI (View).
 def show_dashboard():
     # 1. Initialize Styles
     view.render_global_styles()
+
+    # Manual refresh: drop only the dashboard fetch caches so this rerun
+    # refetches. Unrelated cache_data entries (chat history, user data,
+    # indicator downloads) stay warm.
+    with st.sidebar:
+        if st.button("Refresh Market Data", use_container_width=True):
+            model.get_system_status.clear()
+            model.fetch_ticker_tape_data.clear()
+            model.fetch_global_news.clear()
+            model.fetch_local_news.clear()
+            model.fetch_weekly_movers.clear()
     
     # 2. Data Fetching (Model)
+    # The five fetches hit independent endpoints; run them concurrently
+    # so wall time is the slowest fetch instead of the sum of all five.
     with st.spinner("Analyzing Market Data..."):
-        status = model.get_system_status()
-        ticker_data = model.fetch_ticker_tape_data()
-        global_news = model.fetch_global_news()
-        local_news = model.fetch_local_news()
-        weekly_movers = model.fetch_weekly_movers()
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = {
+                "status": executor.submit(model.get_system_status),
+                "ticker": executor.submit(model.fetch_ticker_tape_data),
+                "global_news": executor.submit(model.fetch_global_news),
+                "local_news": executor.submit(model.fetch_local_news),
+                "movers": executor.submit(model.fetch_weekly_movers),
+            }
+            results = {key: future.result() for key, future in futures.items()}
+
+        status = results["status"]
+        ticker_data = results["ticker"]
+        global_news = results["global_news"]
+        local_news = results["local_news"]
+        weekly_movers = results["movers"]
 
     # 3. Render Layout
     
@@ -12,6 +12,7 @@ from watchlist import show_watchlist
 
 # Import Business Logic
 from modules.auth_manager import verify_login, register_user, get_user_tier, upgrade_to_pro
+from modules.chatbot_model import get_chat_session
 
 # 1. App Configuration
 load_dotenv()
@@ -27,12 +28,18 @@ st.markdown(DASHBOARD_CSS, unsafe_allow_html=True)
 st.markdown("""<style>[data-testid="stSidebarNav"] { display: none !important; }</style>""", unsafe_allow_html=True)
 
 # 2. State Management
-if "active_page" not in st.session_state: st.session_state.active_page = "Dashboard"
-if "logged_in" not in st.session_state: st.session_state.logged_in = False
-if "username" not in st.session_state: st.session_state.username = ""
+st.session_state.setdefault("active_page", "Dashboard")
+st.session_state.setdefault("logged_in", False)
+st.session_state.setdefault("username", "")
 
 def logout():
     """Clears session and resets state."""
+    # Drop only this user's cached Gemini session; a bare clear() would
+    # reset every logged-in user's conversation context process-wide
+    if st.session_state.username:
+        get_chat_session.clear(st.session_state.username)
+    st.session_state.pop("_auth_token", None)
+    st.session_state.pop("_tier", None)
     st.session_state.logged_in = False
     st.session_state.username = ""
     st.session_state.active_page = "Dashboard"
@@ -47,6 +54,8 @@ if not st.session_state.logged_in:
         if verify_login(cred_data["username"], cred_data["password"]):
             st.session_state.logged_in = True
             st.session_state.username = cred_data["username"]
+            # Cache tier for the session; only upgrade_to_pro changes it
+            st.session_state["_tier"] = get_user_tier(cred_data["username"])
             st.rerun()
         else:
             st.error("Authentication failed. Invalid username or password.")
@@ -59,8 +68,11 @@ if not st.session_state.logged_in:
 else:
     # --- AUTHENTICATED SESSION ---
     
-    # A. Fetch Data
-    current_tier = get_user_tier(st.session_state.username)
+    # A. Fetch Data (session-cached tier; DB only on cache miss)
+    current_tier = st.session_state.get("_tier")
+    if current_tier is None:
+        current_tier = get_user_tier(st.session_state.username)
+        st.session_state["_tier"] = current_tier
     
     # B. Render Sidebar & Handle Navigation
     nav_action = main_view.render_sidebar(st.session_state.username, current_tier)
@@ -69,11 +81,13 @@ else:
         logout()
     elif nav_action == "UPGRADE_ACTION":
         upgrade_to_pro(st.session_state.username)
+        st.session_state["_tier"] = "pro"
         st.toast("Account upgraded to PRO successfully!", icon="🚀")
         st.rerun()
     elif nav_action:
+        # Button press already triggered this rerun; the router below
+        # picks up the new page in the same script execution.
         st.session_state.active_page = nav_action
-        st.rerun()
 
     # C. Router - Load Page Controller 
     if st.session_state.active_page == "Dashboard":
@@ -1,122 +1,286 @@
-import hashlib
-import json
-import os
-from datetime import datetime
-from typing import Dict, Tuple, Any, Optional
-
-# CONFIGURATION
-DATA_DIR = "data"
-USERS_FILE = os.path.join(DATA_DIR, "users.json")
-FREE_DAILY_LIMIT = 5  # Kuota harian untuk user Free
-
-# INTERNAL HELPERS
-def _load_db() -> Dict[str, Any]:
-    """Load the full user database."""
-    if not os.path.exists(USERS_FILE):
-        return {}
-    try:
-        with open(USERS_FILE, "r") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return {}
-
-def _save_db(data: Dict[str, Any]) -> None:
-    """Save the database atomically."""
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
-    with open(USERS_FILE, "w") as f:
-        json.dump(data, f, indent=2)
-
-def _hash_password(password: str) -> str:
-    """Securely hash the password."""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def _get_today_str() -> str:
-    """Return current date as YYYY-MM-DD string."""
-    return datetime.now().strftime("%Y-%m-%d")
-
-# AUTHENTICATION FUNCTIONS
-def register_user(username: str, password: str) -> Tuple[bool, str]:
-    """Register a new user with default 'free' tier."""
-    users = _load_db()
-    
-    if not username or not password:
-        return False, "Username dan Password wajib diisi."
-    
-    if username in users:
-        return False, "Username sudah digunakan."
-    
-    # Initialize User Profile
-    users[username] = {
-        "password": _hash_password(password),
-        "tier": "free",          # Default tier
-        "quota_usage": 0,        # Usage counter
-        "last_reset": _get_today_str()
-    }
-    _save_db(users)
-    return True, "Registrasi berhasil! Silakan login."
-
-def verify_login(username: str, password: str) -> bool:
-    """Verify credentials."""
-    users = _load_db()
-    if username not in users:
-        return False
-    
-    stored_hash = users[username].get("password")
-    input_hash = _hash_password(password)
-    return stored_hash == input_hash
-
-# QUOTA & TIER MANAGEMENT
-def get_user_tier(username: str) -> str:
-    """Get user's current tier (free/pro)."""
-    users = _load_db()
-    return users.get(username, {}).get("tier", "free")
-
-def check_quota_available(username: str) -> Tuple[bool, str]:
-    """
-    Check if user has quota left for today.
-    Auto-resets quota if the day has changed.
-    """
-    users = _load_db()
-    if username not in users:
-        return False, "User not found."
-    
-    user_data = users[username]
-    tier = user_data.get("tier", "free")
-    
-    # PRO users have no limits
-    if tier == "pro":
-        return True, "Unlimited Access"
-    
-    # Handle FREE users
-    today = _get_today_str()
-    last_reset = user_data.get("last_reset", "")
-    
-    # Reset counter if new day
-    if last_reset != today:
-        user_data["last_reset"] = today
-        user_data["quota_usage"] = 0
-        _save_db(users)
-        return True, f"Quota Reset. {FREE_DAILY_LIMIT} left."
-    
-    # Check Limit
-    current_usage = user_data.get("quota_usage", 0)
-    if current_usage < FREE_DAILY_LIMIT:
-        remaining = FREE_DAILY_LIMIT - current_usage
-        return True, f"Sisa kuota: {remaining}"
-    else:
-        return False, "Kuota harian habis. Upgrade ke PRO untuk akses tanpa batas."
-
-def increment_usage(username: str) -> None:
-    """Increment the usage counter after a successful API call."""
-    users = _load_db()
-    if username in users:
-        users[username]["quota_usage"] = users[username].get("quota_usage", 0) + 1
-        _save_db(users)
-
-def upgrade_to_pro(username: str) -> None:
-    """Upgrade user tier to PRO (Demo function)."""
-    users = _load_db()
-    if username in users:
-        users[username]["tier"] = "pro"
-        _save_db(users)
\ No newline at end of file
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Tuple, Optional
+
+import streamlit as st
+
+# CONFIGURATION
+DATA_DIR = "data"
+USERS_FILE = os.path.join(DATA_DIR, "users.json")  # Legacy store, dimigrasi sekali
+USERS_DB = os.path.join(DATA_DIR, "users.db")
+FREE_DAILY_LIMIT = 5  # Kuota harian untuk user Free
+PBKDF2_ITERATIONS = 100_000  # Iterasi key-stretching untuk password hash
+
+# INTERNAL HELPERS
+_db_lock = threading.Lock()
+
+# Per-process secret for session re-auth tokens (reset on server restart)
+_session_secret = secrets.token_bytes(32)
+
+@st.cache_resource(show_spinner=False)
+def _get_conn() -> sqlite3.Connection:
+    """
+    Shared SQLite connection for the user store (WAL mode).
+    Per-user operations touch a single indexed row instead of
+    re-serializing a monolithic JSON blob; the legacy users.json is
+    imported on first open.
+    """
+    if not os.path.exists(DATA_DIR):
+        os.makedirs(DATA_DIR)
+    conn = sqlite3.connect(USERS_DB, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            password TEXT NOT NULL,
+            tier TEXT NOT NULL DEFAULT 'free',
+            quota_usage INTEGER NOT NULL DEFAULT 0,
+            last_reset TEXT NOT NULL DEFAULT ''
+        )"""
+    )
+    conn.commit()
+    _migrate_legacy_json(conn)
+    return conn
+
+def _migrate_legacy_json(conn: sqlite3.Connection) -> None:
+    """One-time import of the old users.json blob into the users table."""
+    if not os.path.exists(USERS_FILE):
+        return
+    if conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] > 0:
+        return
+    try:
+        with open(USERS_FILE, "r") as f:
+            legacy = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return
+    for username, data in legacy.items():
+        conn.execute(
+            "INSERT OR IGNORE INTO users (username, password, tier, quota_usage, last_reset) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                username,
+                data.get("password", ""),
+                data.get("tier", "free"),
+                data.get("quota_usage", 0),
+                data.get("last_reset", ""),
+            ),
+        )
+    conn.commit()
+
+def _hash_password(password: str, salt: Optional[bytes] = None) -> str:
+    """Hash the password with PBKDF2-HMAC-SHA256 and a per-user random salt."""
+    if salt is None:
+        salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS)
+    return f"pbkdf2${salt.hex()}${digest.hex()}"
+
+def _verify_password(password: str, stored_hash: str) -> bool:
+    """Check a password against the stored hash (PBKDF2 or legacy SHA-256)."""
+    if stored_hash.startswith("pbkdf2$"):
+        try:
+            _, salt_hex, digest_hex = stored_hash.split("$")
+        except ValueError:
+            return False
+        digest = hashlib.pbkdf2_hmac(
+            "sha256", password.encode(), bytes.fromhex(salt_hex), PBKDF2_ITERATIONS
+        )
+        return hmac.compare_digest(digest.hex(), digest_hex)
+    # Legacy unsalted SHA-256 entries
+    legacy = hashlib.sha256(password.encode()).hexdigest()
+    return hmac.compare_digest(legacy, stored_hash or "")
+
+def _session_token(username: str, password: str) -> str:
+    """
+    Derive the per-session re-auth token from the full credentials.
+    Binding the password in means a wrong password can never match the
+    cached token, so the shortcut only fires for a genuine re-auth.
+    """
+    msg = f"{username}\x00{password}".encode()
+    return hmac.new(_session_secret, msg, "sha256").hexdigest()
+
+def _get_today_str() -> str:
+    """Return current date as YYYY-MM-DD string."""
+    return datetime.now().strftime("%Y-%m-%d")
+
+# AUTHENTICATION FUNCTIONS
+def register_user(username: str, password: str) -> Tuple[bool, str]:
+    """Register a new user with default 'free' tier."""
+    if not username or not password:
+        return False, "Username dan Password wajib diisi."
+
+    conn = _get_conn()
+    with _db_lock:
+        try:
+            conn.execute(
+                "INSERT INTO users (username, password, tier, quota_usage, last_reset) "
+                "VALUES (?, ?, 'free', 0, ?)",
+                (username, _hash_password(password), _get_today_str()),
+            )
+            conn.commit()
+        except sqlite3.IntegrityError:
+            return False, "Username sudah digunakan."
+    return True, "Registrasi berhasil! Silakan login."
+
+def verify_login(username: str, password: str) -> bool:
+    """
+    Verify credentials.
+    Re-auth within the same session short-circuits on a cached token
+    (constant-time compare) so reruns skip key-stretching entirely.
+    """
+    # Hot path: same credentials already authenticated in this session
+    token = st.session_state.get("_auth_token")
+    if token and hmac.compare_digest(token, _session_token(username, password)):
+        return True
+
+    conn = _get_conn()
+    row = conn.execute(
+        "SELECT password FROM users WHERE username = ?", (username,)
+    ).fetchone()
+    if row is None:
+        return False
+
+    stored_hash = row[0] or ""
+    if not _verify_password(password, stored_hash):
+        return False
+
+    # Transparently upgrade legacy SHA-256 entries to salted PBKDF2
+    if not stored_hash.startswith("pbkdf2$"):
+        with _db_lock:
+            conn.execute(
+                "UPDATE users SET password = ? WHERE username = ?",
+                (_hash_password(password), username),
+            )
+            conn.commit()
+
+    st.session_state["_auth_token"] = _session_token(username, password)
+    return True
+
+# QUOTA & TIER MANAGEMENT
+def get_user_tier(username: str) -> str:
+    """Get user's current tier (free/pro)."""
+    row = _get_conn().execute(
+        "SELECT tier FROM users WHERE username = ?", (username,)
+    ).fetchone()
+    return row[0] if row else "free"
+
+def _reset_if_new_day(conn: sqlite3.Connection, username: str, last_reset: str) -> bool:
+    """Zero the usage counter when the day has rolled over."""
+    today = _get_today_str()
+    if last_reset == today:
+        return False
+    with _db_lock:
+        conn.execute(
+            "UPDATE users SET quota_usage = 0, last_reset = ? WHERE username = ?",
+            (today, username),
+        )
+        conn.commit()
+    return True
+
+def check_quota_available(username: str) -> Tuple[bool, str]:
+    """
+    Check if user has quota left for today.
+    Auto-resets quota if the day has changed.
+    """
+    conn = _get_conn()
+    row = conn.execute(
+        "SELECT tier, quota_usage, last_reset FROM users WHERE username = ?",
+        (username,),
+    ).fetchone()
+    if row is None:
+        return False, "User not found."
+
+    tier, current_usage, last_reset = row
+
+    # PRO users have no limits
+    if tier == "pro":
+        return True, "Unlimited Access"
+
+    # Reset counter if new day
+    if _reset_if_new_day(conn, username, last_reset):
+        return True, f"Quota Reset. {FREE_DAILY_LIMIT} left."
+
+    # Check Limit
+    if current_usage < FREE_DAILY_LIMIT:
+        remaining = FREE_DAILY_LIMIT - current_usage
+        return True, f"Sisa kuota: {remaining}"
+    else:
+        return False, "Kuota harian habis. Upgrade ke PRO untuk akses tanpa batas."
+
+def consume_quota(username: str) -> Tuple[bool, str]:
+    """
+    Atomically check and consume one unit of today's quota.
+
+    Fuses the day-reset, limit check, and usage increment into a single
+    guarded UPDATE so callers do not need a separate check + increment.
+    """
+    conn = _get_conn()
+    row = conn.execute(
+        "SELECT tier, quota_usage, last_reset FROM users WHERE username = ?",
+        (username,),
+    ).fetchone()
+    if row is None:
+        return False, "User not found."
+
+    tier, current_usage, last_reset = row
+
+    # PRO users have no limits
+    if tier == "pro":
+        return True, "Unlimited Access"
+
+    if _reset_if_new_day(conn, username, last_reset):
+        current_usage = 0
+
+    with _db_lock:
+        cursor = conn.execute(
+            "UPDATE users SET quota_usage = quota_usage + 1 "
+            "WHERE username = ? AND quota_usage < ?",
+            (username, FREE_DAILY_LIMIT),
+        )
+        conn.commit()
+    if cursor.rowcount == 0:
+        return False, "Kuota harian habis. Upgrade ke PRO untuk akses tanpa batas."
+
+    remaining = FREE_DAILY_LIMIT - (current_usage + 1)
+    return True, f"Sisa kuota: {remaining}"
+
+def refund_quota(username: str) -> None:
+    """
+    Return one quota unit after a failed request.
+
+    consume_quota charges up front to keep the check+increment atomic;
+    callers refund here when the model never delivered an answer.
+    """
+    conn = _get_conn()
+    with _db_lock:
+        conn.execute(
+            "UPDATE users SET quota_usage = quota_usage - 1 "
+            "WHERE username = ? AND quota_usage > 0",
+            (username,),
+        )
+        conn.commit()
+
+def increment_usage(username: str) -> None:
+    """Increment the usage counter after a successful API call."""
+    conn = _get_conn()
+    with _db_lock:
+        conn.execute(
+            "UPDATE users SET quota_usage = quota_usage + 1 WHERE username = ?",
+            (username,),
+        )
+        conn.commit()
+
+def upgrade_to_pro(username: str) -> None:
+    """Upgrade user tier to PRO (Demo function)."""
+    conn = _get_conn()
+    with _db_lock:
+        conn.execute(
+            "UPDATE users SET tier = 'pro' WHERE username = ?", (username,)
+        )
+        conn.commit()
@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Optional
+
+"""
+CACHE MODULE
+------------
+Responsibility: Disk-backed TTL caching for external API payloads.
+st.cache_data only lives as long as the Streamlit process; entries here
+survive restarts/redeploys, so a reboot does not re-spend API quota for
+responses that are still fresh.
+
+Only JSON-serializable payloads belong here (news responses, status
+strings). Market-data frames stay in st.cache_data.
+"""
+
+CACHE_DIR = os.path.join("data", ".cache")
+
+
+class FileCache:
+    """
+    Minimal JSON-file cache. Each entry is one file named by the MD5 of
+    its key, holding {"ts": <epoch>, "value": <payload>}.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl: int = 1800):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value, or None if missing/expired/corrupt."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry["ts"] > self.ttl:
+                return None
+            return entry["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Stores a JSON-serializable value; failures are non-fatal."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            # Write-then-replace so readers never see a partial entry
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"ts": time.time(), "value": value}, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"FileCache write skipped: {e}")
@@ -1,18 +1,25 @@
+import hashlib
 import os
 import json
-import pandas as pd
+import streamlit as st
 from typing import List, Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:  # Optional C-extension speedup; stdlib json fallback
+    orjson = None
+
 # IMPORT TOOLS & UTILS
 from modules.finance_tools import (
     get_stock_price, 
     calculate_SMA, 
     calculate_EMA,
-    calculate_RSI, 
-    calculate_MACD, 
+    calculate_RSI,
+    calculate_MACD,
+    get_indicators,
     plot_interactive_chart,
-    get_fundamental_data, 
-    analyze_stock_recommendation, 
+    get_fundamental_data,
+    analyze_stock_recommendation,
     analyze_news_relevance,
     get_my_portfolio
 )
@@ -33,41 +40,63 @@ DATA_DIR = "data"
 ROLE_USER = "user"
 ROLE_MODEL = "model"
 
+# Single source of truth for the tool registry: the injection list and the
+# name->callable map are both derived from this tuple, so adding a tool is
+# a one-line change that cannot drift out of sync.
+_TOOLS = (
+    get_stock_price,
+    calculate_SMA,
+    calculate_EMA,
+    calculate_RSI,
+    calculate_MACD,
+    get_indicators,
+    plot_interactive_chart,
+    get_fundamental_data,
+    analyze_stock_recommendation,
+    analyze_news_relevance,
+    get_my_portfolio,
+)
+_TOOLS_MAP = {fn.__name__: fn for fn in _TOOLS}
+
 #CORE INITIALIZATION
 def initialize_chat_session():
     """
     Menginisialisasi sesi chat Gemini dan menyuntikkan (Inject) semua tools.
     Fungsi ini dipanggil oleh main.py / chatbot.py.
     """
-    # 1. semua fungsi tools
-    tools_list = [
-        get_stock_price, 
-        calculate_SMA, 
-        calculate_EMA,
-        calculate_RSI, 
-        calculate_MACD, 
-        plot_interactive_chart,
-        get_fundamental_data, 
-        analyze_stock_recommendation, 
-        analyze_news_relevance,
-        get_my_portfolio
-    ]
-
-    # 2. Load model dengan tools list (Dependency Injection)
-    model = load_gemini_model(tools=tools_list)
+    # Load model dengan tools list (Dependency Injection)
+    model = load_gemini_model(tools=list(_TOOLS))
     
-    # 3. Return chat object
+    # Return chat object
     chat = model.start_chat(enable_automatic_function_calling=True)
     return chat
 
+@st.cache_resource(show_spinner=False)
+def get_chat_session(username: str):
+    """
+    Long-lived Gemini chat session pinned per user.
+    Survives reruns and page switches without re-injecting the tool
+    schema; cleared explicitly on logout.
+    """
+    return initialize_chat_session()
+
 
 # CONTEXT SERVICE
 
+def _portfolio_fingerprint(raw_portfolio: List[Dict]) -> str:
+    """Stable digest of the holdings, used as the context cache key."""
+    payload = json.dumps(raw_portfolio, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
 def get_portfolio_context(username: str) -> str:
     """
-    Retrieves the current portfolio state and constructs a strategic analysis 
+    Retrieves the current portfolio state and constructs a strategic analysis
     context based on Asset Allocation and Trend Following principles.
 
+    The expensive build (market valuation + prompt assembly) is memoized
+    per (username, portfolio fingerprint) with a 5-minute TTL so repeated
+    portfolio questions in a session reuse the cached context string.
+
     Args:
         username (str): The unique identifier of the active user.
 
@@ -76,14 +105,29 @@ def get_portfolio_context(username: str) -> str:
              valuation metrics, and strict analytical guidelines for the LLM.
     """
     try:
-        # 1. Retrieve & Calculate Data
+        # 1. Retrieve Data
         user_data = load_user_data(username)
         raw_portfolio = user_data.get("portfolio", [])
-        
+
         if not raw_portfolio:
             return "[SYSTEM INFO]: Portfolio is currently empty. No analysis possible."
 
-        performance_data = calculate_portfolio_performance(raw_portfolio)
+        fingerprint = _portfolio_fingerprint(raw_portfolio)
+        return _build_context(username, fingerprint, raw_portfolio)
+
+    except Exception as e:
+        return f"[SYSTEM ERROR in Portfolio Context]: {str(e)}"
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _build_context(username: str, fingerprint: str, _raw_portfolio: List[Dict]) -> str:
+    """
+    Builds the LLM context payload for a portfolio snapshot.
+    Cached on (username, fingerprint); the underscore-prefixed portfolio
+    list is excluded from the cache key by Streamlit convention.
+    """
+    try:
+        # 1. Calculate Data
+        performance_data = calculate_portfolio_performance(_raw_portfolio)
         items = performance_data.get("items", [])
         summary = performance_data.get("summary", {})
         
@@ -91,40 +135,35 @@ def get_portfolio_context(username: str) -> str:
             return "[SYSTEM INFO]: Portfolio data exists but valuation returned no results."
 
         # 2. Data Transformation & Allocation Logic
-        df = pd.DataFrame(items)
-        
-        # Calculate Aggregates for Weighting
+        # A handful of holdings formatted into strings does not warrant a
+        # DataFrame round-trip; a plain loop over the item dicts skips the
+        # construction, projection and column-assignment overhead entirely.
         total_val_idr = summary.get("IDR", {}).get("value", 0)
         total_val_usd = summary.get("USD", {}).get("value", 0)
-        
-        # Projection
-        target_cols = ['symbol', 'qty', 'buy_price', 'curr_price', 'gain_pct', 'curr_val', 'currency']
-        valid_cols = [c for c in target_cols if c in df.columns]
-        display_df = df[valid_cols].copy()
-        
-        # Compute Portfolio Weight (Allocation %)
-        def calc_weight(row):
-            total = total_val_idr if row['currency'] == 'IDR' else total_val_usd
-            return (row['curr_val'] / total * 100) if total > 0 else 0
-            
-        display_df['weight'] = display_df.apply(calc_weight, axis=1)
-
-        # String Formatting for LLM Context
-        display_df['gain_fmt'] = display_df['gain_pct'].map('{:+.2f}%'.format)
-        display_df['weight_fmt'] = display_df['weight'].map('{:.1f}%'.format)
-        display_df['price_fmt'] = display_df['curr_price'].map('{:,.2f}'.format)
-        display_df['val_fmt'] = display_df.apply(
-            lambda x: f"{x['curr_val']:,.0f}" if x['currency'] == 'IDR' else f"{x['curr_val']:,.2f}", 
-            axis=1
-        )
 
-        # Final Context Table
-        final_table = display_df[['symbol', 'price_fmt', 'gain_fmt', 'weight_fmt', 'val_fmt', 'currency']]
-        
-        try:
-            table_str = final_table.to_markdown(index=False)
-        except ImportError:
-            table_str = final_table.to_string(index=False)
+        table_cols = ['symbol', 'price_fmt', 'gain_fmt', 'weight_fmt', 'val_fmt', 'currency']
+        rows = []
+        for item in items:
+            currency = item.get('currency', 'USD')
+            curr_val = item.get('curr_val', 0)
+            total = total_val_idr if currency == 'IDR' else total_val_usd
+            weight = (curr_val / total * 100.0) if total > 0 else 0.0
+            val_fmt = f"{curr_val:,.0f}" if currency == 'IDR' else f"{curr_val:,.2f}"
+            rows.append((
+                item.get('symbol', '?'),
+                f"{item.get('curr_price', 0):,.2f}",
+                f"{item.get('gain_pct', 0):+.2f}%",
+                f"{weight:.1f}%",
+                val_fmt,
+                currency,
+            ))
+
+        # Final Context Table - hand-assembled pipe table (the LLM does not
+        # need to_markdown's per-cell tabulate machinery).
+        header = "| " + " | ".join(table_cols) + " |"
+        separator = "|" + "|".join("---" for _ in table_cols) + "|"
+        body = "\n".join("| " + " | ".join(row) + " |" for row in rows)
+        table_str = "\n".join((header, separator, body))
 
         # Total Values for Prompt
         total_idr = summary.get("IDR", {}).get("value", 0)
@@ -158,72 +197,156 @@ def get_portfolio_context(username: str) -> str:
 def get_tools_map() -> Dict[str, Any]:
     """
     Returns the registry of callable tools available to the AI model.
+    Derived from the module-level _TOOLS tuple.
     """
-    return {
-        "get_stock_price": get_stock_price,
-        "calculate_SMA": calculate_SMA,
-        "calculate_EMA": calculate_EMA,
-        "calculate_RSI": calculate_RSI,
-        "calculate_MACD": calculate_MACD,
-        "plot_interactive_chart": plot_interactive_chart,
-        "get_fundamental_data": get_fundamental_data,
-        "analyze_stock_recommendation": analyze_stock_recommendation,
-        "analyze_news_relevance": analyze_news_relevance,
-        "get_my_portfolio": get_my_portfolio
-    }
+    return _TOOLS_MAP
 
 # PERSISTENCE LAYER
 
+# Deletion table built once at import: strips every Latin-1 character
+# that is not alphanumeric or "_-" in a single C-level translate pass.
+_FILENAME_DEL_TABLE = str.maketrans(
+    "", "",
+    "".join(chr(c) for c in range(256) if not (chr(c).isalnum() or chr(c) in "_-"))
+)
+
+def _safe_filename_part(username: str) -> str:
+    """
+    Allowlist sanitizer (alnum plus "_-"). The translate table only
+    covers Latin-1, so anything wider that survives it goes through the
+    per-character filter; ASCII names (the common case) skip that loop.
+    """
+    cleaned = username.translate(_FILENAME_DEL_TABLE)
+    if not cleaned.isascii():
+        cleaned = "".join(x for x in cleaned if x.isalnum() or x in "_-")
+    return cleaned
+
 def _get_chat_filepath(username: str) -> str:
-    """Generates the secure file path for chat history storage."""
-    clean_name = "".join(x for x in username if x.isalnum() or x in "_-")
-    return os.path.join(DATA_DIR, f"chat_history_{clean_name}.json")
+    """Generates the secure file path for chat history storage (JSONL)."""
+    return os.path.join(DATA_DIR, f"chat_history_{_safe_filename_part(username)}.jsonl")
+
+def _get_legacy_filepath(username: str) -> str:
+    """Path of the old single-JSON-array history format."""
+    return os.path.join(DATA_DIR, f"chat_history_{_safe_filename_part(username)}.json")
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize one history record to a JSONL line (orjson if available)."""
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj) + "\n").encode("utf-8")
+
+def _loads(data) -> Any:
+    """Deserialize a JSON payload (orjson if available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _sanitize_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Drops non-serializable payloads (e.g., Plotly charts) from a message."""
+    # Copy only when there is actually a chart to strip; most messages
+    # are plain text and can be serialized as-is.
+    if message.get("chart") is not None:
+        return {**message, "chart": None}
+    return message
 
 def load_history(username: str) -> List[Dict[str, Any]]:
     """
     Loads chat history from the local filesystem.
-    
+    Reads the JSONL log; falls back to the legacy JSON-array format
+    for histories written before the append-only migration.
+
     Returns:
         List[Dict[str, Any]]: The message history list.
     """
     filepath = _get_chat_filepath(username)
-    if not os.path.exists(filepath):
-        return []
+    if os.path.exists(filepath):
+        try:
+            # Read the whole log in one syscall; parse from memory
+            with open(filepath, "rb") as f:
+                raw = f.read()
+            return [_loads(line) for line in raw.splitlines() if line.strip()]
+        except (ValueError, IOError):
+            return []
+
+    legacy_path = _get_legacy_filepath(username)
+    if os.path.exists(legacy_path):
+        try:
+            with open(legacy_path, "rb") as f:
+                messages = _loads(f.read())
+        except (ValueError, IOError):
+            return []
+        # One-shot migration: rewrite as JSONL and retire the old file
+        # so future turns take the O(1) append path.
+        save_history(username, messages)
+        try:
+            os.remove(legacy_path)
+        except OSError:
+            pass
+        return messages
+    return []
+
+@st.cache_data(show_spinner=False)
+def load_history_cached(username: str) -> List[Dict[str, Any]]:
+    """
+    Cached wrapper around load_history so browser refreshes do not
+    re-read the log from disk. Invalidated whenever the log changes.
+    """
+    return load_history(username)
+
+def append_message(username: str, message: Dict[str, Any]) -> None:
+    """
+    Appends a single message to the user's JSONL log.
+    O(1) bytes written per turn instead of rewriting the full history.
+    """
+    if not os.path.exists(DATA_DIR):
+        os.makedirs(DATA_DIR)
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return []
+        with open(_get_chat_filepath(username), "ab") as f:
+            f.write(_dumps_line(_sanitize_message(message)))
+        load_history_cached.clear()
+    except Exception as e:
+        print(f"Error persisting chat history: {e}")
 
 def save_history(username: str, messages: List[Dict[str, Any]]) -> None:
     """
-    Atomically saves chat history to the local filesystem.
-    Removes non-serializable objects (e.g., charts) prior to dumping.
+    Rewrites the full chat history log (JSONL, one message per line).
+    Prefer append_message for per-turn persistence.
     """
     if not os.path.exists(DATA_DIR):
         os.makedirs(DATA_DIR)
-        
-    filepath = _get_chat_filepath(username)
     try:
-        serializable = []
-        for msg in messages:
-            clean = msg.copy()
-            if "chart" in clean:
-                clean["chart"] = None
-            serializable.append(clean)
-            
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(serializable, f, indent=2)
+        # Serialize everything first, then write in one buffered call.
+        # Written to a sibling tmp file and swapped in with os.replace so
+        # a crash mid-write can never leave a truncated history behind.
+        payload = b"".join(
+            _dumps_line(_sanitize_message(msg)) for msg in messages
+        )
+        filepath = _get_chat_filepath(username)
+        tmp_path = filepath + ".tmp"
+        with open(tmp_path, "wb", buffering=1 << 16) as f:
+            f.write(payload)
+        os.replace(tmp_path, filepath)
+        load_history_cached.clear()
     except Exception as e:
         print(f"Error persisting chat history: {e}")
 
+def clear_history(username: str) -> None:
+    """Deletes the user's persisted chat history (Reset Chat)."""
+    for path in (_get_chat_filepath(username), _get_legacy_filepath(username)):
+        if os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Error clearing chat history: {e}")
+    load_history_cached.clear()
+
 def convert_to_gemini_format(ui_messages: List[Dict]) -> List[Dict]:
-    """
-    Adapts internal message format to the Gemini API schema.
-    """
-    gemini_history = []
-    for msg in ui_messages:
-        role = ROLE_USER if msg["role"] == ROLE_USER else ROLE_MODEL
-        if msg.get("content"):
-            gemini_history.append({"role": role, "parts": [msg["content"]]})
-    return gemini_history
\ No newline at end of file
+    """Adapts internal message format to the Gemini API schema."""
+    return [
+        {
+            "role": ROLE_USER if msg["role"] == ROLE_USER else ROLE_MODEL,
+            "parts": [msg["content"]],
+        }
+        for msg in ui_messages
+        if msg.get("content")
+    ]
\ No newline at end of file
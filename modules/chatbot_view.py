@@ -1,5 +1,4 @@
 import streamlit as st
-import time
 from modules.ui_assets import ICONS
 
 """
@@ -52,24 +51,26 @@ def render_account_status(status_msg: str):
         </div>
     """, unsafe_allow_html=True)
 
-def render_sidebar_controls():
+def render_sidebar_controls() -> bool:
     """
     Renders sidebar interface for chat session management.
-    Handles history reset functionality.
+    Returns True when the user requested a history reset so the
+    controller can purge the persisted log as well.
     """
+    reset_clicked = False
     with st.sidebar:
         st.markdown("### Session Management")
-        
+
         if st.button("Reset Chat", use_container_width=True):
             # Clear session state
             if "chat_history" in st.session_state:
                 st.session_state.chat_history = []
             if "messages" in st.session_state:
                 st.session_state.messages = []
-            
+
             st.toast("Conversation history purged.", icon="🧹")
-            time.sleep(0.5)
-            st.rerun()
+            reset_clicked = True
+    return reset_clicked
 
 def render_chat_messages(messages: list):
     """
@@ -1,152 +1,197 @@
-import pandas as pd
-from GoogleNews import GoogleNews
-from modules.stock_tools import get_stock_data_safe, get_batch_stock_data, yahoo_status
-from modules.news_tools import get_latest_news
-
-"""
-DASHBOARD MODEL MODULE
-----------------------
-Responsibility: Business Logic & Data Access.
-Fixes: 
-1. Google News Tracking Links (Local).
-2. Unicode Escape Sequences like \u003d (Global).
-3. Direct Backslash Escapes like \= (Global - NEW FIX).
-"""
-
-def clean_news_url(url: str) -> str:
-    """
-    Universal URL Cleaner/Sanitizer.
-    Membersihkan URL dari sampah tracking dan encoding yang rusak.
-    """
-    if not url:
-        return "#"
-    
-    # 1. FIX GLOBAL NEWS: Escape Sequences
-    
-    # Handle unicode escape \u003d -> =
-    url = url.replace("\\u003d", "=")
-    # Handle unicode escape \u0026 -> &
-    url = url.replace("\\u0026", "&")
-    
-    # Handle direct backslash escape \= -> =
-    url = url.replace("\\=", "=")
-    # ========================
-    
-    # 2. FIX LOCAL NEWS: Google Tracking Params
-    if '&ved' in url:
-        url = url.split('&ved')[0]
-    if '&usg' in url:
-        url = url.split('&usg')[0]
-        
-    # 3. Protocol Check
-    if not url.startswith('http'):
-        url = f"https://{url}"
-        
-    return url
-
-def get_system_status() -> str:
-    return yahoo_status()
-
-def fetch_ticker_tape_data() -> list:
-    ticker_map = {
-        "AAPL": "Apple", 
-        "NVDA": "NVIDIA",
-        "MSFT": "Microsoft",
-        "TSLA": "Tesla",
-        "AMZN": "Amazon",
-        "BBCA.JK": "BCA", 
-        "BBRI.JK": "BRI", 
-        "BMRI.JK": "Mandiri",
-        "TLKM.JK": "Telkom",
-        "ASII.JK": "Astra"
-    }
-    results = []
-    for symbol, name in ticker_map.items():
-        try:
-            df = get_stock_data_safe(symbol, period="5d")
-            if df is not None and len(df) >= 2:
-                latest = df["Close"].iloc[-1]
-                prev = df["Close"].iloc[-2]
-                change_pct = ((latest - prev) / prev) * 100
-                results.append({
-                    "name": name,
-                    "symbol": symbol,
-                    "value": float(latest),
-                    "change": float(change_pct)
-                })
-        except Exception:
-            continue
-    return results
-
-def fetch_global_news() -> list:
-    news_raw = get_latest_news()
-    processed = []
-    if news_raw and "articles" in news_raw:
-        for article in news_raw["articles"][:4]:
-            raw_url = article.get("url", "#")
-            # call cleaner
-            clean_link = clean_news_url(raw_url)
-            processed.append({
-                "title": article.get("title", "No Title"),
-                "desc": (article.get("description", "") or "")[:150] + "...",
-                "source": article.get("source", {}).get("name", "Unknown"),
-                "url": clean_link,
-                "published": article.get("publishedAt", "")[:10]
-            })
-    return processed
-
-def fetch_local_news() -> list:
-    news_list = []
-    try:
-        googlenews = GoogleNews(lang='id', region='ID')
-        googlenews.search("IHSG Saham Bursa Efek Indonesia Emiten")
-        results = googlenews.result()
-        for item in results[:4]: 
-            raw_link = item.get('link', '#')
-            # call 
-            clean_link = clean_news_url(raw_link)
-            news_list.append({
-                'title': item.get('title', ''),
-                'desc': item.get('desc', ''), 
-                'source': item.get('media', 'Google News'),
-                'published': item.get('date', 'Hari ini'),
-                'url': clean_link
-            })
-        googlenews.clear()
-    except Exception as e:
-        print(f"Model Error (Local News): {e}")
-    return news_list
-
-def fetch_weekly_movers() -> list:
-    candidates = [
-        "NVDA", "TSLA", "AAPL", "MSFT", "COIN",
-        "BBCA.JK", "BBRI.JK", "BMRI.JK", "BBNI.JK", "BRIS.JK",
-        "ADRO.JK", "UNTR.JK", "PTBA.JK", "PGAS.JK", "AKRA.JK",
-        "ANTM.JK", "MDKA.JK", "INCO.JK", "TINS.JK",
-        "GOTO.JK", "TLKM.JK", "ISAT.JK", "EXCL.JK",
-        "ASII.JK", "ICBP.JK", "UNVR.JK", "AMRT.JK"
-    ]
-    try:
-        batch_data = get_batch_stock_data(candidates, period="1mo")
-    except Exception:
-        return []
-    trending_scores = []
-    if not batch_data.empty:
-        for ticker in candidates:
-            try:
-                stock_data = pd.DataFrame()
-                if isinstance(batch_data.columns, pd.MultiIndex):
-                    if ticker in batch_data.columns.levels[0]:
-                        stock_data = batch_data[ticker].copy()
-                else:
-                    stock_data = batch_data.copy()
-                if not stock_data.empty and len(stock_data) >= 7:
-                    latest = stock_data["Close"].dropna().iloc[-1]
-                    prev_week = stock_data["Close"].dropna().iloc[-7]
-                    if prev_week > 0:
-                        delta = ((latest - prev_week) / prev_week) * 100
-                        trending_scores.append((ticker, float(delta), stock_data))
-            except Exception:
-                continue
-    top_trending = sorted(trending_scores, key=lambda x: x[1], reverse=True)[:4]
+import re
+from functools import lru_cache
+
+import pandas as pd
+import streamlit as st
+from modules.stock_tools import get_batch_stock_data, yahoo_status
+from modules.news_tools import get_latest_news
+
+"""
+DASHBOARD MODEL MODULE
+----------------------
+Responsibility: Business Logic & Data Access.
+Fixes: 
+1. Google News Tracking Links (Local).
+2. Unicode Escape Sequences like \u003d (Global).
+3. Direct Backslash Escapes like \= (Global - NEW FIX).
+"""
+
+# Two compiled passes: broken \uXXXX escapes and stray backslash-
+# escapes are decoded first, THEN the Google tracking tail is truncated —
+# so a tail hidden behind \u0026 is visible to the second pass.
+_URL_ESCAPE_RE = re.compile(r"\\u[0-9a-fA-F]{4}|\\=")
+_URL_TRACKING_RE = re.compile(r"&ved.*|&usg.*")
+
+def _url_escape_sub(match) -> str:
+    token = match.group(0)
+    if token == "\\=":
+        return "="
+    return chr(int(token[2:], 16))
+
+@lru_cache(maxsize=1024)
+def clean_news_url(url: str) -> str:
+    """
+    Universal URL Cleaner/Sanitizer.
+    Membersihkan URL dari sampah tracking dan encoding yang rusak.
+    Memoized: the same article URLs repeat across dashboard refreshes.
+    """
+    if not url:
+        return "#"
+
+    url = _URL_ESCAPE_RE.sub(_url_escape_sub, url)
+    url = _URL_TRACKING_RE.sub("", url)
+
+    # Protocol Check
+    if not url.startswith('http'):
+        url = f"https://{url}"
+
+    return url
+
+# NOTE: TTLs are deliberately staggered so the caches do not all expire
+# in lockstep (which would force a full refetch on a single rerun).
+
+@st.cache_data(ttl=120, show_spinner=False)
+def get_system_status() -> str:
+    return yahoo_status()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_ticker_tape_data() -> list:
+    ticker_map = {
+        "AAPL": "Apple", 
+        "NVDA": "NVIDIA",
+        "MSFT": "Microsoft",
+        "TSLA": "Tesla",
+        "AMZN": "Amazon",
+        "BBCA.JK": "BCA", 
+        "BBRI.JK": "BRI", 
+        "BMRI.JK": "Mandiri",
+        "TLKM.JK": "Telkom",
+        "ASII.JK": "Astra"
+    }
+    # Single batch request for all symbols (same pattern as weekly movers)
+    try:
+        batch_data = get_batch_stock_data(list(ticker_map.keys()), period="5d")
+    except Exception:
+        return []
+
+    results = []
+    if batch_data.empty:
+        return results
+
+    for symbol, name in ticker_map.items():
+        try:
+            stock_data = pd.DataFrame()
+            if isinstance(batch_data.columns, pd.MultiIndex):
+                if symbol in batch_data.columns.levels[0]:
+                    stock_data = batch_data[symbol]
+            else:
+                stock_data = batch_data
+
+            if "Close" not in stock_data.columns:
+                continue
+
+            closes = stock_data["Close"].dropna()
+            if len(closes) >= 2:
+                latest = closes.iloc[-1]
+                prev = closes.iloc[-2]
+                change_pct = ((latest - prev) / prev) * 100
+                results.append({
+                    "name": name,
+                    "symbol": symbol,
+                    "value": float(latest),
+                    "change": float(change_pct)
+                })
+        except Exception:
+            continue
+    return results
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_global_news() -> list:
+    news_raw = get_latest_news()
+    processed = []
+    if news_raw and "articles" in news_raw:
+        for article in news_raw["articles"][:4]:
+            raw_url = article.get("url", "#")
+            # call cleaner
+            clean_link = clean_news_url(raw_url)
+            processed.append({
+                "title": article.get("title", "No Title"),
+                "desc": (article.get("description", "") or "")[:150] + "...",
+                "source": article.get("source", {}).get("name", "Unknown"),
+                "url": clean_link,
+                "published": article.get("publishedAt", "")[:10]
+            })
+    return processed
+
+@st.cache_data(ttl=540, show_spinner=False)
+def fetch_local_news() -> list:
+    try:
+        # Lazy import: only loaded when the local-news cache misses
+        from GoogleNews import GoogleNews
+        googlenews = GoogleNews(lang='id', region='ID')
+        googlenews.search("IHSG Saham Bursa Efek Indonesia Emiten")
+        results = googlenews.result()
+        # Throwaway instance; no clear() needed. Only the top 4 are shaped.
+        return [
+            {
+                'title': item.get('title', ''),
+                'desc': item.get('desc', ''),
+                'source': item.get('media', 'Google News'),
+                'published': item.get('date', 'Hari ini'),
+                'url': clean_news_url(item.get('link', '#'))
+            }
+            for item in results[:4]
+        ]
+    except Exception as e:
+        print(f"Model Error (Local News): {e}")
+        return []
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_weekly_movers() -> list:
+    candidates = [
+        "NVDA", "TSLA", "AAPL", "MSFT", "COIN",
+        "BBCA.JK", "BBRI.JK", "BMRI.JK", "BBNI.JK", "BRIS.JK",
+        "ADRO.JK", "UNTR.JK", "PTBA.JK", "PGAS.JK", "AKRA.JK",
+        "ANTM.JK", "MDKA.JK", "INCO.JK", "TINS.JK",
+        "GOTO.JK", "TLKM.JK", "ISAT.JK", "EXCL.JK",
+        "ASII.JK", "ICBP.JK", "UNVR.JK", "AMRT.JK"
+    ]
+    try:
+        batch_data = get_batch_stock_data(candidates, period="1mo")
+    except Exception:
+        return []
+    if batch_data.empty:
+        return []
+
+    # Single vectorized pct-change over the Close slice (columns=tickers)
+    # instead of per-ticker DataFrame copies and Python-level divisions.
+    try:
+        if isinstance(batch_data.columns, pd.MultiIndex):
+            closes = batch_data.xs("Close", level=1, axis=1)
+        else:
+            closes = batch_data[["Close"]].rename(columns={"Close": candidates[0]})
+    except KeyError:
+        return []
+
+    # Forward-fill gaps (suspensions / different trading calendars) so a
+    # single missing row does not knock a ticker out of the ranking.
+    closes = closes.dropna(how="all").ffill()
+    if len(closes) < 7:
+        return []
+
+    latest = closes.iloc[-1]
+    prev_week = closes.iloc[-7]
+    pct = ((latest - prev_week) / prev_week) * 100
+    pct = pct[prev_week > 0].replace([float("inf"), float("-inf")], pd.NA).dropna()
+
+    top = pct.nlargest(4)
+
+    # Attach per-ticker slices lazily, only for the 4 winners
+    top_trending = []
+    for ticker, delta in top.items():
+        if isinstance(batch_data.columns, pd.MultiIndex):
+            stock_data = batch_data[ticker]
+        else:
+            stock_data = batch_data
+        top_trending.append((ticker, float(delta), stock_data))
     return top_trending
\ No newline at end of file
@@ -1,29 +1,113 @@
 import os
-import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Union
 
-import yfinance as yf
-import plotly.graph_objects as go
 import streamlit as st
 import pandas as pd
 import numpy as np
-from GoogleNews import GoogleNews
-from newsapi import NewsApiClient
+
+# Shared orjson-or-stdlib JSON parser (single bytes read, C-level parse)
+from modules.json_utils import loads as _loads
+
+# yfinance and plotly are deliberately NOT imported at module load: both
+# pull in large dependency trees and are only needed once a tool call
+# actually fetches data or draws a chart. sys.modules makes the repeated
+# in-function imports effectively free after the first one.
 
 # 1. HELPER FUNCTIONS
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_history(ticker: str, period: str) -> pd.DataFrame:
+    """
+    Cached per (ticker, period) so multiple indicator tools in one
+    conversation share a single download. Raises on an empty fetch so
+    failures are NOT cached and the next call retries.
+    """
+    # LAZY IMPORT
+    import yfinance as yf
+    df = yf.Ticker(ticker).history(period=period)
+    if df.empty:
+        raise ValueError(f"No history returned for {ticker} ({period})")
+    return df
+
 def get_stock_data_safe(ticker: str, period: str = "1y") -> Optional[pd.DataFrame]:
     """
     Retrieves historical stock data with error handling.
+    A transient yfinance error returns None without poisoning the cache
+    for the full TTL.
     """
     try:
-        stock = yf.Ticker(ticker)
-        df = stock.history(period=period)
-        if df.empty:
-            return None
-        return df
+        return _fetch_history(ticker, period)
     except Exception:
         return None
 
+def _rsi_last(close: np.ndarray, window: int = 14) -> float:
+    """
+    Last RSI value from a closing-price array.
+    Equivalent to the rolling-mean RSI but computed on the final window
+    only, avoiding full-length Series allocations per call.
+    """
+    delta = np.diff(close[-(window + 1):])
+    gain = np.maximum(delta, 0.0).mean()
+    loss = np.maximum(-delta, 0.0).mean()
+    if loss == 0:
+        return 100.0
+    return 100.0 - (100.0 / (1.0 + gain / loss))
+
+def _macd_last(close: np.ndarray) -> tuple:
+    """
+    Last (MACD, Signal, Histogram) values via a single fused pass.
+    Replaces three full ewm() Series with scalar recurrences sharing
+    one loop (identical to pandas ewm(adjust=False) results).
+    """
+    alpha12 = 2.0 / 13.0
+    alpha26 = 2.0 / 27.0
+    alpha9 = 2.0 / 10.0
+
+    ema12 = ema26 = close[0]
+    signal = 0.0
+    macd = 0.0
+    for x in close[1:]:
+        ema12 += alpha12 * (x - ema12)
+        ema26 += alpha26 * (x - ema26)
+        macd = ema12 - ema26
+        signal += alpha9 * (macd - signal)
+    return macd, signal, macd - signal
+
+def _compute_indicators(df: pd.DataFrame) -> dict:
+    """
+    Computes every scalar the recommendation report needs in one pass
+    over contiguous NumPy arrays. Replaces six independent rolling
+    Series allocations (plus a pd.concat for the ATR true range) with
+    tail-window reductions that yield identical last values.
+    """
+    close = df['Close'].to_numpy(dtype=np.float64)
+    high = df['High'].to_numpy(dtype=np.float64)
+    low = df['Low'].to_numpy(dtype=np.float64)
+    vol = df['Volume'].to_numpy(dtype=np.float64)
+
+    # True range needs the previous close, hence the 1-offset views
+    prev_close = close[:-1]
+    true_range = np.maximum.reduce([
+        high[1:] - low[1:],
+        np.abs(high[1:] - prev_close),
+        np.abs(low[1:] - prev_close),
+    ])
+
+    vol_avg_20 = vol[-20:].mean()
+    return {
+        'price': close[-1],
+        'sma20': close[-20:].mean(),
+        'sma50': close[-50:].mean(),
+        'prev_sma20': close[-21:-1].mean(),
+        'prev_sma50': close[-51:-1].mean(),
+        'rsi': _rsi_last(close),
+        'atr': true_range[-14:].mean(),
+        'vol_ratio': vol[-1] / vol_avg_20 if vol_avg_20 > 0 else 0.0,
+        'high_20': high[-20:].max(),
+        'recent_high': high[-90:].max(),
+        'recent_low': low[-90:].min(),
+    }
+
 def clean_ticker_for_news(ticker: str) -> str:
     """
     Sanitizes the ticker symbol by removing exchange suffixes for news searches.
@@ -31,62 +115,83 @@ def clean_ticker_for_news(ticker: str) -> str:
     return ticker.replace(".JK", "").replace(".jk", "").replace(".T", "")
 
 # 2. BASIC TECHNICAL & FUNDAMENTAL TOOLS
-def get_stock_price(ticker: str) -> str:
-    """Fetches the most recent closing price."""
+# The scalar tools return plain floats (not stringified numbers) so the
+# tool layer can format at the edge instead of re-parsing; the error
+# branches keep their descriptive strings for the LLM.
+def get_stock_price(ticker: str) -> Union[float, str]:
+    """Fetches the most recent closing price as a number."""
     df = get_stock_data_safe(ticker, period='1d')
-    if df is None: 
+    if df is None:
         return "Price data not found."
-    return str(df.iloc[-1].Close)
+    return float(df['Close'].iat[-1])
 
-def calculate_SMA(ticker: str, window: int = 20) -> str:
-    """Calculates the Simple Moving Average (SMA)."""
+def calculate_SMA(ticker: str, window: int = 20) -> Union[float, str]:
+    """Calculates the Simple Moving Average (SMA) as a number."""
     df = get_stock_data_safe(ticker, period='2y')
-    if df is None: 
+    if df is None:
         return "Insufficient data."
-    return str(df['Close'].rolling(window=window).mean().iloc[-1])
+    return float(df['Close'].to_numpy()[-window:].mean())
 
-def calculate_EMA(ticker: str, window: int = 20) -> str:
-    """Calculates the Exponential Moving Average (EMA)."""
+def calculate_EMA(ticker: str, window: int = 20) -> Union[float, str]:
+    """Calculates the Exponential Moving Average (EMA) as a number."""
     df = get_stock_data_safe(ticker, period='2y')
-    if df is None: 
+    if df is None:
         return "Insufficient data."
-    return str(df['Close'].ewm(span=window, adjust=False).mean().iloc[-1])
+    return float(df['Close'].ewm(span=window, adjust=False).mean().iat[-1])
 
-def calculate_RSI(ticker: str, window: int = 14) -> str:
-    """Calculates the Relative Strength Index (RSI)."""
+def calculate_RSI(ticker: str, window: int = 14) -> Union[float, str]:
+    """Calculates the Relative Strength Index (RSI) as a number."""
     df = get_stock_data_safe(ticker, period='6mo')
-    if df is None: 
+    if df is None:
         return "Insufficient data."
-    
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return str(rsi.iloc[-1])
+    return float(_rsi_last(df['Close'].to_numpy(), window))
 
 def calculate_MACD(ticker: str) -> str:
     """Calculates MACD, Signal, and Histogram values."""
     df = get_stock_data_safe(ticker, period='1y')
-    if df is None: 
+    if df is None:
         return "Insufficient data."
-    
-    short_EMA = df['Close'].ewm(span=12, adjust=False).mean()
-    long_EMA = df['Close'].ewm(span=26, adjust=False).mean()
-    macd_line = short_EMA - long_EMA
-    signal_line = macd_line.ewm(span=9, adjust=False).mean()
-    hist = macd_line - signal_line
-    
-    return (f"MACD: {macd_line.iloc[-1]:.2f}, "
-            f"Signal: {signal_line.iloc[-1]:.2f}, "
-            f"Hist: {hist.iloc[-1]:.2f}")
 
+    macd, signal, hist = _macd_last(df['Close'].to_numpy())
+    return (f"MACD: {macd:.2f}, "
+            f"Signal: {signal:.2f}, "
+            f"Hist: {hist:.2f}")
+
+def get_indicators(ticker: str, window: int = 20) -> str:
+    """
+    Computes SMA, EMA, RSI, and MACD in one pass from a single history
+    fetch. Prefer this over calling the individual indicator tools when
+    more than one metric is needed.
+    """
+    df = get_stock_data_safe(ticker, period='1y')
+    if df is None:
+        return "Insufficient data."
+
+    close = df['Close']
+    close_arr = close.to_numpy()
+    sma = close_arr[-window:].mean()
+    ema = close.ewm(span=window, adjust=False).mean().iat[-1]
+
+    rsi = _rsi_last(close_arr)
+    macd, signal, hist = _macd_last(close_arr)
+
+    return (f"Indicators {ticker.upper()}:\n"
+            f"- SMA({window}): {sma:,.2f}\n"
+            f"- EMA({window}): {ema:,.2f}\n"
+            f"- RSI(14): {rsi:.2f}\n"
+            f"- MACD: {macd:.2f}, "
+            f"Signal: {signal:.2f}, "
+            f"Hist: {hist:.2f}")
+
+@st.cache_data(ttl=3600, show_spinner=False)
 def get_fundamental_data(ticker: str) -> str:
     """
     Retrieves key fundamental metrics (Market Cap, P/E, EPS, PBV).
+    Cached for an hour; fundamentals do not move intraday.
     """
     try:
+        # LAZY IMPORT
+        import yfinance as yf
         info = yf.Ticker(ticker).info
         return (f"Data Fundamental {ticker.upper()}:\n"
                 f"- Market Cap: {info.get('marketCap', 'N/A')}\n"
@@ -101,20 +206,43 @@ def plot_interactive_chart(ticker: str) -> str:
     """
     Generates and caches an interactive technical analysis chart (Plotly).
     """
+    return _plot_chart(ticker)
+
+def _plot_chart(ticker: str, df: Optional[pd.DataFrame] = None) -> str:
+    """
+    Chart builder behind the plot_interactive_chart tool. Accepts an
+    optional pre-fetched 6-month frame so callers that already hold one
+    (analyze_stock_recommendation) skip the duplicate fetch; the public
+    tool keeps its string-only signature for the LLM schema.
+    """
     try:
-        # 1. Data Fetching
-        df = get_stock_data_safe(ticker, period='6mo') 
+        # LAZY IMPORT
+        import plotly.graph_objects as go
+
+        # 1. Data Fetching (skipped when the caller supplies the frame)
+        if df is None:
+            df = get_stock_data_safe(ticker, period='6mo')
         if df is None:
             return f"Error: Failed to retrieve chart data for {ticker}."
 
         # 2. Indicator Calculations
-        df['SMA20'] = df['Close'].rolling(window=20).mean()
-        df['SMA50'] = df['Close'].rolling(window=50).mean()
+        # Only compute an overlay when enough bars exist; an all-NaN
+        # rolling series still costs the computation and inflates the
+        # figure payload sent to the frontend. (No SMA200 here - the
+        # longest window this chart draws is 50.)
+        has_sma20 = len(df) >= 20
+        has_sma50 = len(df) >= 50
+        if has_sma20:
+            df['SMA20'] = df['Close'].rolling(window=20).mean()
+        if has_sma50:
+            df['SMA50'] = df['Close'].rolling(window=50).mean()
 
         # Fibonacci Calculation (90-day lookback window)
-        recent_data = df.tail(90)
-        high_price = recent_data['High'].max()
-        low_price = recent_data['Low'].min()
+        # One tail view + NumPy reductions instead of per-column .tail()
+        # Series allocations.
+        tail90 = df.iloc[max(0, len(df) - 90):]
+        high_price = float(tail90['High'].to_numpy().max())
+        low_price = float(tail90['Low'].to_numpy().min())
         price_range = high_price - low_price
         
         fib_levels = {
@@ -123,45 +251,51 @@ def plot_interactive_chart(ticker: str) -> str:
             "Fib 0.618": high_price - (price_range * 0.618)
         }
 
-        # 3. Figure Construction
-        fig = go.Figure()
-
-        # Candlestick Trace
-        fig.add_trace(go.Candlestick(
-            x=df.index,
-            open=df['Open'], high=df['High'],
-            low=df['Low'], close=df['Close'],
-            name=f'{ticker} Price'
-        ))
-
-        # Moving Average Traces
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['SMA20'], 
-            mode='lines', name='SMA 20', 
-            line=dict(color='#22c55e', width=1.5)
-        ))
-        fig.add_trace(go.Scatter(
-            x=df.index, y=df['SMA50'], 
-            mode='lines', name='SMA 50', 
-            line=dict(color='#ef4444', width=1.5)
-        ))
-
-        # Fibonacci Annotations
-        start_date_fib = df.index[len(df)//2] 
+        # 3. Figure Construction - all traces passed to the constructor
+        # in one list, so plotly validates the figure once instead of
+        # per add_trace call.
+        traces = [
+            go.Candlestick(
+                x=df.index,
+                open=df['Open'], high=df['High'],
+                low=df['Low'], close=df['Close'],
+                name=f'{ticker} Price'
+            ),
+        ]
+        if has_sma20:
+            traces.append(go.Scatter(
+                x=df.index, y=df['SMA20'],
+                mode='lines', name='SMA 20',
+                line=dict(color='#22c55e', width=1.5)
+            ))
+        if has_sma50:
+            traces.append(go.Scatter(
+                x=df.index, y=df['SMA50'],
+                mode='lines', name='SMA 50',
+                line=dict(color='#ef4444', width=1.5)
+            ))
+        fig = go.Figure(data=traces)
+
+        # Fibonacci Annotations - built as plain lists and attached in the
+        # single update_layout call below, so the layout is validated once
+        # instead of per add_shape/add_annotation mutation.
+        start_date_fib = df.index[len(df)//2]
         end_date_fib = df.index[-1]
         colors_fib = {"Fib 0.382": "orange", "Fib 0.500": "yellow", "Fib 0.618": "cyan"}
-        
-        for level_name, price in fib_levels.items():
-            fig.add_shape(type="line",
-                x0=start_date_fib, y0=price, x1=end_date_fib, y1=price,
-                line=dict(color=colors_fib[level_name], width=1, dash="dot"),
-            )
-            fig.add_annotation(
-                x=end_date_fib, y=price,
-                text=f"{level_name}: {price:,.0f}",
-                showarrow=False, xanchor="left", yanchor="middle",
-                font=dict(color=colors_fib[level_name], size=10)
-            )
+
+        shapes = [
+            dict(type="line",
+                 x0=start_date_fib, y0=price, x1=end_date_fib, y1=price,
+                 line=dict(color=colors_fib[level_name], width=1, dash="dot"))
+            for level_name, price in fib_levels.items()
+        ]
+        annotations = [
+            dict(x=end_date_fib, y=price,
+                 text=f"{level_name}: {price:,.0f}",
+                 showarrow=False, xanchor="left", yanchor="middle",
+                 font=dict(color=colors_fib[level_name], size=10))
+            for level_name, price in fib_levels.items()
+        ]
 
         # 4. Layout Configuration
         fig.update_layout(
@@ -170,7 +304,9 @@ def plot_interactive_chart(ticker: str) -> str:
             template="plotly_dark",
             margin=dict(l=20, r=80, t=50, b=20),
             xaxis_rangeslider_visible=False,
-            legend=dict(orientation="h", y=1, x=0, xanchor="left", yanchor="bottom")
+            legend=dict(orientation="h", y=1, x=0, xanchor="left", yanchor="bottom"),
+            shapes=shapes,
+            annotations=annotations
         )
         
         # Cache figure to session state
@@ -181,49 +317,99 @@ def plot_interactive_chart(ticker: str) -> str:
         return f"Chart generation error: {str(e)}"
 
 # 4. NEWS & SENTIMENT ANALYSIS TOOLS
-def get_hybrid_news(ticker: str) -> str:
-    """
-    Aggregates news from Google News (Local) and NewsAPI (Global).
-    """
-    news_results = []
-    clean_symbol = clean_ticker_for_news(ticker)
-    
-    # Source 1: Google News (Priority: Local/ID)
+def _fetch_google_news(clean_symbol: str) -> list:
+    """Fetches local (ID) headlines from Google News."""
+    results = []
     try:
+        # LAZY IMPORT
+        from GoogleNews import GoogleNews
         googlenews = GoogleNews(lang='id', region='ID')
         googlenews.search(f"Saham {clean_symbol}")
-        g_results = googlenews.result()
-        
-        for item in g_results[:3]: 
+        for item in googlenews.result()[:3]:
             title = item.get('title', '')
             date = item.get('date', '')
             link = item.get('link', '')
             if title:
-                news_results.append(f"[GoogleNews] {date}: {title} ({link})")
+                results.append(f"[GoogleNews] {date}: {title} ({link})")
     except Exception as e:
         print(f"Google News Error: {e}")
+    return results
+
+def _fetch_newsapi_news(clean_symbol: str, api_key: str) -> list:
+    """Fetches global (EN) headlines from NewsAPI."""
+    results = []
+    try:
+        # LAZY IMPORT (shared, cached client)
+        from modules.news_tools import get_newsapi_client
+        newsapi = get_newsapi_client(api_key)
+        response = newsapi.get_everything(q=clean_symbol, language='en', sort_by='relevancy', page_size=3)
+        if response['status'] == 'ok':
+            for item in response['articles']:
+                title = item.get('title', '')
+                source = item.get('source', {}).get('name', 'NewsAPI')
+                link = item.get('url', '')
+                if title:
+                    results.append(f"[{source}] {title} ({link})")
+    except Exception as e:
+        print(f"NewsAPI Error: {e}")
+    return results
 
-    # Source 2: NewsAPI (Priority: Global/US)
+@st.cache_data(ttl=600, show_spinner=False)
+def get_hybrid_news(ticker: str) -> str:
+    """
+    Aggregates news from Google News (Local) and NewsAPI (Global).
+    The two sources are independent blocking round trips, so they run
+    concurrently; total wall time is the slower fetch, not the sum.
+    Cached per ticker so back-to-back analyses skip the refetch.
+    """
+    clean_symbol = clean_ticker_for_news(ticker)
     api_key = os.getenv("NEWS_API_KEY")
-    if api_key:
-        try:
-            newsapi = NewsApiClient(api_key=api_key)
-            response = newsapi.get_everything(q=clean_symbol, language='en', sort_by='relevancy', page_size=3)
-            if response['status'] == 'ok':
-                for item in response['articles']:
-                    title = item.get('title', '')
-                    source = item.get('source', {}).get('name', 'NewsAPI')
-                    link = item.get('url', '')
-                    if title:
-                        news_results.append(f"[{source}] {title} ({link})")
-        except Exception as e:
-            print(f"NewsAPI Error: {e}")
-    
+
+    news_results = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(_fetch_google_news, clean_symbol)]
+        if api_key:
+            futures.append(executor.submit(_fetch_newsapi_news, clean_symbol, api_key))
+        for future in futures:
+            try:
+                news_results.extend(future.result(timeout=8))
+            except Exception as e:
+                print(f"News fetch timeout/error: {e}")
+
     if not news_results:
         return "No significant news found in the last 7 days."
-    
+
     return "\n\n".join(news_results)
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _company_name(ticker: str) -> str:
+    """
+    Resolves a ticker's long company name via yf.Ticker().info - the
+    slowest yfinance call (multiple HTTP requests). Cached for an hour
+    and reduced to the one key needed, so the bulky info dict is not
+    serialized into the cache.
+    """
+    try:
+        # LAZY IMPORT
+        import yfinance as yf
+        return yf.Ticker(ticker).info.get('longName', ticker)
+    except Exception:
+        return ticker
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_newsapi_articles(query: str, api_key: str) -> list:
+    """Cached NewsAPI article search; the LLM analysis stays uncached."""
+    # LAZY IMPORT (shared, cached client)
+    from modules.news_tools import get_newsapi_client
+    newsapi = get_newsapi_client(api_key)
+    news = newsapi.get_everything(
+        q=query,
+        language='en',
+        sort_by='relevancy',
+        page_size=5
+    )
+    return news.get('articles') or []
+
 def analyze_news_relevance(ticker: str, topic: Optional[str] = None) -> str:
     """
     Fetches news and uses the configured LLM to perform sentiment analysis.
@@ -236,24 +422,12 @@ def analyze_news_relevance(ticker: str, topic: Optional[str] = None) -> str:
         return "Error: Missing NEWS_API_KEY in environment variables."
 
     try:
-        newsapi = NewsApiClient(api_key=news_api_key)
-        
-        # Resolve full company name for better search relevance
-        try:
-            company_name = yf.Ticker(ticker).info.get('longName', ticker)
-        except Exception:
-            company_name = ticker
+        # Resolve full company name for better search relevance (cached)
+        company_name = _company_name(ticker)
 
         query = f'"{company_name}" AND "{topic}"' if topic else f'"{company_name}"'
-        
-        news = newsapi.get_everything(
-            q=query, 
-            language='en', 
-            sort_by='relevancy', 
-            page_size=5
-        )
-        
-        articles = news.get('articles')
+
+        articles = _fetch_newsapi_articles(query, news_api_key)
         if not articles:
             return f"No relevant news found for {company_name}."
 
@@ -288,70 +462,70 @@ def analyze_stock_recommendation(ticker: str) -> str:
     Generates a comprehensive technical analysis report for swing trading strategies.
     Aggregates Price Action, Trend (MA20/50), Momentum, Fibonacci, and ATR.
     """
+    report = _build_recommendation_report(ticker)
+    # Chart generation writes the figure into session_state, so it stays
+    # outside the cached report builder and re-runs per request; the data
+    # fetch underneath is cached, making this cheap on repeat asks.
+    df = get_stock_data_safe(ticker, period="6mo")
+    if df is not None:
+        _plot_chart(ticker, df=df)
+    return report
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _build_recommendation_report(ticker: str) -> str:
+    """
+    Builds the report text. Deterministic given the day's data, so it is
+    memoized per ticker - follow-up questions about the same symbol
+    skip the whole indicator + news pipeline.
+    """
     # 1. Data Retrieval
     df = get_stock_data_safe(ticker, period="6mo")
     if df is None:
         return f"Error: Failed to retrieve data for {ticker}. Verify symbol or connectivity."
 
-    # 2. Technical Indicators
-    current_price = df['Close'].iloc[-1]
-    
+    # 2. Technical Indicators (single fused pass over the arrays)
+    ind = _compute_indicators(df)
+    current_price = ind['price']
+
     # A. Trend Analysis (MA 20/50)
-    sma_20 = df['Close'].rolling(window=20).mean().iloc[-1]
-    sma_50 = df['Close'].rolling(window=50).mean().iloc[-1]
+    sma_20 = ind['sma20']
+    sma_50 = ind['sma50']
     trend_status = "BULLISH" if sma_20 > sma_50 else "BEARISH"
-    
-    prev_sma_20 = df['Close'].rolling(window=20).mean().iloc[-2]
-    prev_sma_50 = df['Close'].rolling(window=50).mean().iloc[-2]
+
     cross_signal = "None"
-    if prev_sma_20 < prev_sma_50 and sma_20 > sma_50: cross_signal = "GOLDEN CROSS"
-    elif prev_sma_20 > prev_sma_50 and sma_20 < sma_50: cross_signal = "DEATH CROSS"
+    if ind['prev_sma20'] < ind['prev_sma50'] and sma_20 > sma_50: cross_signal = "GOLDEN CROSS"
+    elif ind['prev_sma20'] > ind['prev_sma50'] and sma_20 < sma_50: cross_signal = "DEATH CROSS"
 
     # B. Price Action (Breakout & Pullback)
-    high_20 = df['High'].rolling(window=20).max().iloc[-1]
+    high_20 = ind['high_20']
     is_breakout = current_price >= high_20
     breakout_msg = "POTENTIAL BREAKOUT" if is_breakout else "In Range"
-    
+
     dist_to_sma20 = ((current_price - sma_20) / sma_20) * 100
     is_pullback = trend_status == "BULLISH" and -2 <= dist_to_sma20 <= 2
     pullback_msg = "PULLBACK ZONE (Near SMA 20)" if is_pullback else "None"
 
     # C. Momentum
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs)).iloc[-1]
+    rsi = ind['rsi']
     rsi_status = "NEUTRAL"
     if rsi > 70: rsi_status = "OVERBOUGHT"
     if rsi < 30: rsi_status = "OVERSOLD"
 
-    vol_today = df['Volume'].iloc[-1]
-    vol_avg_20 = df['Volume'].rolling(window=20).mean().iloc[-1]
-    vol_ratio = vol_today / vol_avg_20 if vol_avg_20 > 0 else 0
+    vol_ratio = ind['vol_ratio']
     vol_status = "SPIKE" if vol_ratio > 1.5 else "NORMAL"
 
     # D. Fibonacci
-    recent_high = df['High'].tail(90).max()
-    recent_low = df['Low'].tail(90).min()
-    diff = recent_high - recent_low
-    fib_618 = recent_high - (diff * 0.618) 
-    fib_500 = recent_high - (diff * 0.5)   
-    fib_382 = recent_high - (diff * 0.382) 
+    diff = ind['recent_high'] - ind['recent_low']
+    fib_618 = ind['recent_high'] - (diff * 0.618)
+    fib_500 = ind['recent_high'] - (diff * 0.5)
+    fib_382 = ind['recent_high'] - (diff * 0.382)
 
     # E. Risk (ATR)
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift())
-    low_close = np.abs(df['Low'] - df['Close'].shift())
-    true_range = np.max(pd.concat([high_low, high_close, low_close], axis=1), axis=1)
-    atr = true_range.rolling(14).mean().iloc[-1]
+    atr = ind['atr']
     suggested_sl = current_price - (atr * 2)
 
     # 3. Sentiment
     news_summary = get_hybrid_news(ticker)
-    
-    # Force Chart Generation
-    plot_interactive_chart(ticker)
 
     # 4. Report Construction
     report = f"""
@@ -396,14 +570,22 @@ def analyze_stock_recommendation(ticker: str) -> str:
     return report
 
 # 6. PORTFOLIO TOOLS
+@st.cache_data(show_spinner=False)
+def _read_portfolio_file(file_path: str, mtime: float) -> dict:
+    """
+    Cached on (path, mtime): reruns reuse the parsed payload and the
+    entry invalidates by itself when the file changes on disk.
+    """
+    with open(file_path, "rb") as f:
+        return _loads(f.read())
+
 def get_my_portfolio() -> str:
     """Reads raw portfolio data from local JSON storage."""
     try:
         FILE_PATH = os.path.join("data", "user_data.json")
-        if not os.path.exists(FILE_PATH): 
+        if not os.path.exists(FILE_PATH):
             return "Data is empty."
-        with open(FILE_PATH, "r") as f:
-            data = json.load(f)
+        data = _read_portfolio_file(FILE_PATH, os.path.getmtime(FILE_PATH))
         return str(data.get("portfolio", []))
-    except Exception: 
+    except Exception:
         return "Error reading data."
\ No newline at end of file
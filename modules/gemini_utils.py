@@ -1,10 +1,13 @@
 import os
 import google.generativeai as genai
+import streamlit as st
 from dotenv import load_dotenv
 
-def load_gemini_model(tools=None):
+@st.cache_resource(show_spinner=False)
+def _configure_genai() -> None:
     """
-    Menginisialisasi model Gemini dengan System Instruction STRICT.
+    One-time SDK setup per process: .env parsing dan genai.configure
+    hanya jalan sekali (st.cache_resource), bukan tiap rerun.
     """
     load_dotenv()
     api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
@@ -14,6 +17,15 @@ def load_gemini_model(tools=None):
 
     genai.configure(api_key=api_key)
 
+def load_gemini_model(tools=None):
+    """
+    Menginisialisasi model Gemini dengan System Instruction STRICT.
+    Sengaja TIDAK di-cache: `tools` berisi function objects yang tidak
+    bisa di-hash oleh cache Streamlit, dan pemanggil chat sudah
+    meng-cache model+sesi lewat get_chat_session.
+    """
+    _configure_genai()
+
     # SYSTEM INSTRUCTION
     system_instruction = """
     ROLE: You are 'FinAssist', a specialized Institutional Stock Analyst AI.
@@ -0,0 +1,27 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional C-extension speedup; stdlib json fallback
+    orjson = None
+
+"""
+JSON UTILS MODULE
+-----------------
+Responsibility: Shared JSON (de)serialization.
+One home for the orjson-or-stdlib shim, so model modules do not reach
+into each other's private helpers (or drag their imports along).
+"""
+
+def loads(data: bytes) -> Any:
+    """Deserialize a JSON payload (orjson if available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to indented JSON bytes (orjson if available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
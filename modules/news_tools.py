@@ -1,6 +1,20 @@
 import os
 import streamlit as st
-from newsapi import NewsApiClient
+from modules.cache import FileCache
+
+# Disk layer under st.cache_data: headlines survive a process restart,
+# so a redeploy inside the TTL window does not re-spend NewsAPI quota.
+_news_cache = FileCache(ttl=1800)
+
+@st.cache_resource(show_spinner=False)
+def get_newsapi_client(api_key: str):
+    """
+    Shared NewsApiClient instance. The client keeps an HTTP session, so
+    reusing one per API key avoids re-instantiating it on every fetch.
+    """
+    # Lazy import: keeps the SDK off the critical startup path
+    from newsapi import NewsApiClient
+    return NewsApiClient(api_key=api_key)
 
 @st.cache_data(ttl=1800)
 def get_latest_news():
@@ -13,21 +27,26 @@ def get_latest_news():
     if not api_key:
         return {"articles": []}
 
+    cached = _news_cache.get("top_headlines:business:us")
+    if cached is not None:
+        return cached
+
     try:
-        newsapi = NewsApiClient(api_key=api_key)
-        
+        newsapi = get_newsapi_client(api_key)
+
         # Ambil 50 berita
         response = newsapi.get_top_headlines(
             category="business",
             language="en",
-            country="us", 
-            page_size=100 
+            country="us",
+            page_size=100
         )
-        
+
         if response.get('status') == 'ok':
+            _news_cache.set("top_headlines:business:us", response)
             return response
         else:
             return {"articles": []}
-            
+
     except Exception as e:
         return {"articles": []}
\ No newline at end of file
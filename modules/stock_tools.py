@@ -5,15 +5,23 @@ import time
 import requests
 
 # Ambil data 1 saham (detail)
+# NOTE: tidak lagi dipanggil dashboard (ticker tape pindah ke batch);
+# sengaja dipertahankan sebagai fetch publik satu-saham untuk pemakaian
+# ad-hoc, lengkap dengan retry/backoff 429-nya.
 @st.cache_data(ttl=600, show_spinner=False)
 def get_stock_data_safe(ticker: str, period: str = "1mo") -> pd.DataFrame:
-    try:
-        time.sleep(0.1)
-        data = yf.download(ticker, period=period, progress=False, auto_adjust=True)
-        if _is_valid(data):
-             return _flatten_columns(data)
-    except Exception:
-        pass
+    # No pre-emptive sleep: back off only when Yahoo actually rate-limits
+    for attempt in range(3):
+        try:
+            data = yf.download(ticker, period=period, progress=False, auto_adjust=True)
+            if _is_valid(data):
+                return _flatten_columns(data)
+            break
+        except Exception as e:
+            if "429" in str(e) and attempt < 2:
+                time.sleep(0.5 * 2 ** attempt)
+                continue
+            break
     return pd.DataFrame()
 
 # Ambil data banyak saham sekaligus
@@ -28,8 +36,9 @@ def get_batch_stock_data(tickers: list, period: str = "1mo") -> pd.DataFrame:
     
     try:
         ticker_str = " ".join(tickers)
-        # group_by='ticker'
-        data = yf.download(ticker_str, period=period, group_by='ticker', progress=False, auto_adjust=True)
+        # group_by='ticker'; threads=True -> yfinance fans the per-ticker
+        # requests out concurrently inside the single call
+        data = yf.download(ticker_str, period=period, group_by='ticker', progress=False, auto_adjust=True, threads=True)
         return data
     except Exception as e:
         print(f"Batch download error: {e}")
@@ -2,9 +2,12 @@ import os
 import json
 import tempfile
 import shutil
+import numpy as np
 import pandas as pd
+import streamlit as st
 from typing import Dict, Any, List, Optional
 from modules.stock_tools import get_batch_stock_data
+from modules.json_utils import loads as _loads, dumps as _dumps
 
 """
 WATCHLIST MODEL MODULE
@@ -29,6 +32,16 @@ def _get_user_filepath(username: str) -> str:
     clean_name = "".join(x for x in username if x.isalnum() or x in "_-")
     return os.path.join(DATA_DIR, f"portfolio_{clean_name}.json")
 
+@st.cache_data(show_spinner=False)
+def _read_user_file(file_path: str, mtime: float) -> Dict[str, Any]:
+    """
+    Parses a user data file. Cached on (path, mtime): repeated loads in
+    a session skip the open+parse, and the entry invalidates on its own
+    as soon as the file changes on disk.
+    """
+    with open(file_path, "rb") as f:
+        return _loads(f.read())
+
 def load_user_data(username: str) -> Dict[str, Any]:
     """
     Retrieves user data from the persistent storage.
@@ -51,11 +64,10 @@ def load_user_data(username: str) -> Dict[str, Any]:
     
     if os.path.exists(file_path):
         try:
-            with open(file_path, "r") as f:
-                loaded = json.load(f)
-                default_data.update(loaded)
-                return default_data
-        except (json.JSONDecodeError, IOError):
+            loaded = _read_user_file(file_path, os.path.getmtime(file_path))
+            default_data.update(loaded)
+            return default_data
+        except (json.JSONDecodeError, IOError, OSError):
             return default_data
     return default_data
 
@@ -72,8 +84,8 @@ def save_user_data(username: str, data: Dict[str, Any]) -> None:
     try:
         file_path = _get_user_filepath(username)
         # Write to temp file first to ensure atomicity
-        with tempfile.NamedTemporaryFile("w", delete=False, dir=DATA_DIR) as tmp:
-            json.dump(data, tmp, indent=2)
+        with tempfile.NamedTemporaryFile("wb", delete=False, dir=DATA_DIR) as tmp:
+            tmp.write(_dumps(data))
             tmp.flush()
             os.fsync(tmp.fileno())
         shutil.move(tmp.name, file_path)
@@ -97,8 +109,9 @@ def calculate_portfolio_performance(portfolio_items: List[Dict]) -> Dict[str, An
     if not portfolio_items:
         return {"items": [], "summary": {}}
 
-    # Extract unique tickers for batch processing
-    tickers = list(set([item["symbol"] for item in portfolio_items]))
+    # Extract unique tickers for batch processing (dict.fromkeys keeps
+    # first-seen order, so the batch columns line up deterministically)
+    tickers = list(dict.fromkeys(item["symbol"] for item in portfolio_items))
     
     # Fetch market data with 5-day lookback to capture Last Closing Price
     try:
@@ -106,76 +119,66 @@ def calculate_portfolio_performance(portfolio_items: List[Dict]) -> Dict[str, An
     except Exception:
         batch_data = pd.DataFrame()
 
-    processed_items = []
-    totals = {
-        "IDR": {"invested": 0, "value": 0},
-        "USD": {"invested": 0, "value": 0}
-    }
-
     # Propagate last valid observation forward to handle non-trading days
     if not batch_data.empty:
         batch_data = batch_data.ffill()
 
-    for idx, item in enumerate(portfolio_items):
-        sym = item["symbol"]
-        qty = float(item["quantity"])
-        buy_price = float(item["buy_price"])
-        currency = item.get("currency", "USD")
-        
-        curr_price = 0.0
-        is_error = True
-        
-        # Price Retrieval Logic
+    # Resolve every symbol's last close in ONE vectorized pass: slice the
+    # Close columns, take the (already forward-filled) last row, and keep
+    # whatever survived as a ticker -> price mapping.
+    prices: Dict[str, float] = {}
+    if not batch_data.empty:
         try:
-            if not batch_data.empty:
+            if isinstance(batch_data.columns, pd.MultiIndex):
                 # Handle MultiIndex DataFrame (Multiple Tickers)
-                if isinstance(batch_data.columns, pd.MultiIndex):
-                    if sym in batch_data.columns.levels[0]:
-                        series = batch_data[sym]["Close"]
-                        val = series.dropna().iloc[-1]
-                        if pd.notna(val):
-                            curr_price = float(val)
-                            is_error = False
-                            
-                # Handle Single Index DataFrame (Single Ticker or Flattened)
-                elif "Close" in batch_data.columns:
-                    if len(tickers) == 1:
-                        val = batch_data["Close"].dropna().iloc[-1]
-                        if pd.notna(val):
-                            curr_price = float(val)
-                            is_error = False
-                    elif sym in batch_data.columns:
-                        val = batch_data[sym].dropna().iloc[-1]
-                        if pd.notna(val):
-                            curr_price = float(val)
-                            is_error = False
+                last = batch_data.xs("Close", level=1, axis=1).iloc[-1]
+            elif "Close" in batch_data.columns and len(tickers) == 1:
+                # Handle Single Index DataFrame (Single Ticker)
+                last = pd.Series({tickers[0]: batch_data["Close"].iloc[-1]})
+            else:
+                # Flattened columns: one column per ticker
+                cols = [s for s in tickers if s in batch_data.columns]
+                last = batch_data[cols].iloc[-1] if cols else pd.Series(dtype=float)
+            prices = {sym: float(val) for sym, val in last.items() if pd.notna(val)}
         except Exception:
-            pass
-
-        # Metric Calculations
-        inv_val = buy_price * qty
-        curr_val = curr_price * qty
-        gain_loss = curr_val - inv_val
-        
-        # Prevent division by zero
-        gain_pct = (gain_loss / inv_val * 100) if inv_val > 0 else 0
-
-        # Aggregation
-        target_curr = "IDR" if currency == "IDR" else "USD"
-        totals[target_curr]["invested"] += inv_val
-        totals[target_curr]["value"] += curr_val
+            prices = {}
+
+    # Structure-of-arrays: the P/L math runs as vectorized NumPy
+    # expressions over per-column arrays instead of per-row Python floats
+    symbols = [item["symbol"] for item in portfolio_items]
+    currencies = [item.get("currency", "USD") for item in portfolio_items]
+    qty = np.array([float(item["quantity"]) for item in portfolio_items])
+    buy_price = np.array([float(item["buy_price"]) for item in portfolio_items])
+    curr_price = np.array([prices.get(s, 0.0) for s in symbols])
+
+    inv_val = buy_price * qty
+    curr_val = curr_price * qty
+    gain_loss = curr_val - inv_val
+    # Prevent division by zero
+    safe_inv = np.where(inv_val > 0, inv_val, 1.0)
+    gain_pct = np.where(inv_val > 0, gain_loss / safe_inv * 100, 0.0)
+
+    # Aggregation via currency mask
+    is_idr = np.array([c == "IDR" for c in currencies], dtype=bool)
+    totals = {
+        "IDR": {"invested": float(inv_val[is_idr].sum()), "value": float(curr_val[is_idr].sum())},
+        "USD": {"invested": float(inv_val[~is_idr].sum()), "value": float(curr_val[~is_idr].sum())}
+    }
 
-        processed_items.append({
+    processed_items = [
+        {
             "index": idx,
             "symbol": sym,
-            "qty": qty,
-            "buy_price": buy_price,
-            "curr_price": curr_price,
-            "curr_val": curr_val,
-            "gain_loss": gain_loss,
-            "gain_pct": gain_pct,
-            "currency": currency,
-            "is_error": is_error
-        })
-        
+            "qty": float(qty[idx]),
+            "buy_price": float(buy_price[idx]),
+            "curr_price": float(curr_price[idx]),
+            "curr_val": float(curr_val[idx]),
+            "gain_loss": float(gain_loss[idx]),
+            "gain_pct": float(gain_pct[idx]),
+            "currency": currencies[idx],
+            "is_error": sym not in prices
+        }
+        for idx, sym in enumerate(symbols)
+    ]
+
     return {"items": processed_items, "summary": totals}
\ No newline at end of file